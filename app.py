@@ -2,8 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 from datetime import datetime
+import gzip
+from string import Template
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -16,7 +22,7 @@ st.set_page_config(
 )
 
 # Custom CSS for professional styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -75,7 +81,56 @@ st.markdown("""
         border-top: 1px solid #E5E7EB;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Static HTML fragments
+PRIORITY_COLORS = {
+    'High': '#EF4444',
+    'Medium': '#F59E0B',
+    'Low': '#10B981'
+}
+
+RECOMMENDATION_CARD_HTML = Template("""
+<div class="recommendation-card">
+    <div style="display: flex; justify-content: space-between; align-items: center;">
+        <div>
+            <h4 style="margin: 0; color: $priority_color;">$type • $priority Priority</h4>
+            <p style="margin: 0.5rem 0; color: #4B5563;">$description</p>
+        </div>
+        <div style="background-color: $priority_color; color: white; padding: 0.5rem 1rem; border-radius: 5px; font-weight: bold;">
+            #$rank
+        </div>
+    </div>
+    <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-top: 1rem;">
+        <div>
+            <small>Investment</small>
+            <p style="font-weight: bold; margin: 0.25rem 0;">$investment</p>
+        </div>
+        <div>
+            <small>Annual Savings</small>
+            <p style="font-weight: bold; margin: 0.25rem 0;">$annual_savings</p>
+        </div>
+        <div>
+            <small>Payback Period</small>
+            <p style="font-weight: bold; margin: 0.25rem 0;">$payback</p>
+        </div>
+    </div>
+</div>
+""")
+
+FOOTER_HTML = """
+<div class="footer">
+    <p><strong>Factory Energy Retrofit Simulator</strong> | Professional Energy Audit Tool v2.1</p>
+    <p>Made By <strong>Areeb Rizwan</strong>, Mechanical Engineer</p>
+    <p>🌐 Website: <a href="https://www.areebrizwan.com" target="_blank">www.areebrizwan.com</a></p>
+    <p>💼 LinkedIn: <a href="https://www.linkedin.com/in/areebrizwan" target="_blank">www.linkedin.com/in/areebrizwan</a></p>
+    <p style="font-size: 0.8rem; margin-top: 1rem; color: #9CA3AF;">
+        Disclaimer: This tool provides estimates based on standard engineering models. 
+        Actual savings may vary based on specific site conditions and implementation.
+    </p>
+</div>
+"""
 
 # Title and header
 st.markdown('<h1 class="main-header">🏭 Factory Energy Retrofit Simulator</h1>', unsafe_allow_html=True)
@@ -118,14 +173,19 @@ with st.sidebar:
 class MotorSystem:
     """Motor efficiency and performance models"""
     
-    # Motor efficiency curves (IE2, IE3, IE4 standards)
-    EFFICIENCY_CURVES = {
-        'IE1': {0.25: 0.78, 0.50: 0.85, 0.75: 0.88, 1.00: 0.89},
-        'IE2': {0.25: 0.82, 0.50: 0.88, 0.75: 0.90, 1.00: 0.91},
-        'IE3': {0.25: 0.85, 0.50: 0.90, 0.75: 0.92, 1.00: 0.93},
-        'IE4': {0.25: 0.88, 0.50: 0.93, 0.75: 0.95, 1.00: 0.96}
+    # Motor efficiency curves (IE1-IE4 standards) at each load point
+    EFFICIENCY_LOADS = (0.25, 0.50, 0.75, 1.00)
+    EFFICIENCY_VALUES = {
+        'IE1': (0.78, 0.85, 0.88, 0.89),
+        'IE2': (0.82, 0.88, 0.90, 0.91),
+        'IE3': (0.85, 0.90, 0.92, 0.93),
+        'IE4': (0.88, 0.93, 0.95, 0.96)
     }
     
+    # VFD savings curve - typical savings at different load factors
+    VFD_SAVINGS_LOADS = (0.25, 0.50, 0.75, 1.00)
+    VFD_SAVINGS_VALUES = (0.40, 0.25, 0.10, 0.00)  # 40% savings at 25% load down to 0% at full load
+    
     # Motor costs by rating ($/kW)
     MOTOR_COSTS = {
         'IE2': 50.0,
@@ -134,44 +194,26 @@ class MotorSystem:
     }
     
     @staticmethod
-    def get_efficiency(efficiency_class, load_factor):
-        """Get motor efficiency based on class and load factor"""
-        curve = MotorSystem.EFFICIENCY_CURVES.get(efficiency_class, MotorSystem.EFFICIENCY_CURVES['IE2'])
-        load_points = list(curve.keys())
-        efficiencies = list(curve.values())
-        
-        # Interpolate for given load factor
-        for i in range(len(load_points)-1):
-            if load_points[i] <= load_factor <= load_points[i+1]:
-                x1, x2 = load_points[i], load_points[i+1]
-                y1, y2 = efficiencies[i], efficiencies[i+1]
-                return y1 + (y2 - y1) * (load_factor - x1) / (x2 - x1)
-        
-        return efficiencies[-1] if load_factor >= 1.0 else efficiencies[0]
+    def class_indices(efficiency_classes):
+        """Map efficiency class names to row indices of the lookup tables"""
+        return np.array([CLASS_IDX.get(c, CLASS_IDX['IE2']) for c in efficiency_classes], dtype=int)
+    
+    @staticmethod
+    def get_efficiencies(class_idx, load_factors):
+        """Get motor efficiencies for arrays of class indices and load factors"""
+        load_factors = np.clip(np.asarray(load_factors, dtype=float), _IE_XP[0], _IE_XP[-1])
+        
+        # Locate each load factor's curve segment and interpolate within it
+        bins = np.clip(np.searchsorted(_IE_XP, load_factors, side='right') - 1, 0, len(_IE_XP) - 2)
+        x1, x2 = _IE_XP[bins], _IE_XP[bins + 1]
+        y1, y2 = EFF_TABLE[class_idx, bins], EFF_TABLE[class_idx, bins + 1]
+        return y1 + (y2 - y1) * (load_factors - x1) / (x2 - x1)
     
     @staticmethod
     def calculate_vfd_savings(load_factor, motor_power, operating_hours, electricity_cost):
-        """Calculate savings from VFD implementation"""
-        # VFD savings curve - typical savings at different load factors
-        vfd_savings_curve = {
-            0.25: 0.40,  # 40% savings at 25% load
-            0.50: 0.25,  # 25% savings at 50% load
-            0.75: 0.10,  # 10% savings at 75% load
-            1.00: 0.00   # 0% savings at full load
-        }
-        
+        """Calculate savings from VFD implementation (scalars or arrays)"""
         # Interpolate savings percentage
-        load_points = list(vfd_savings_curve.keys())
-        savings_pct = list(vfd_savings_curve.values())
-        
-        for i in range(len(load_points)-1):
-            if load_points[i] <= load_factor <= load_points[i+1]:
-                x1, x2 = load_points[i], load_points[i+1]
-                y1, y2 = savings_pct[i], savings_pct[i+1]
-                savings = y1 + (y2 - y1) * (load_factor - x1) / (x2 - x1)
-                break
-        else:
-            savings = savings_pct[-1] if load_factor >= 1.0 else savings_pct[0]
+        savings = np.interp(load_factor, _VFD_XP, _VFD_FP)
         
         # Calculate energy consumption without VFD
         base_power = motor_power * load_factor
@@ -183,6 +225,16 @@ class MotorSystem:
         
         return saved_energy, cost_savings, savings * 100
 
+# Lookup tables indexed by efficiency class (IE1=0 .. IE4=3); IE1 falls back to the IE2 cost
+CLASS_IDX = {cls: i for i, cls in enumerate(MotorSystem.EFFICIENCY_VALUES)}
+_IE_XP = np.array(MotorSystem.EFFICIENCY_LOADS)
+EFF_TABLE = np.array(tuple(MotorSystem.EFFICIENCY_VALUES.values()))
+MOTOR_COST_ARR = np.array([MotorSystem.MOTOR_COSTS.get(cls, MotorSystem.MOTOR_COSTS['IE2']) for cls in CLASS_IDX])
+
+# Interpolation grid for the VFD savings curve
+_VFD_XP = np.array(MotorSystem.VFD_SAVINGS_LOADS)
+_VFD_FP = np.array(MotorSystem.VFD_SAVINGS_VALUES)
+
 class LightingSystem:
     """Lighting system models"""
     
@@ -199,6 +251,11 @@ class LightingSystem:
         """Calculate annual lighting energy consumption"""
         return float(num_fixtures * wattage_per_fixture * operating_hours / 1000.0)  # kWh
 
+# Lighting technology specs as arrays, in LIGHTING_TYPES order
+LIGHTING_TYPE_NAMES = np.array(list(LightingSystem.LIGHTING_TYPES.keys()))
+LIGHTING_EFFICACIES = np.array([specs['efficacy'] for specs in LightingSystem.LIGHTING_TYPES.values()])
+LIGHTING_LIFETIMES = np.array([specs['lifetime'] for specs in LightingSystem.LIGHTING_TYPES.values()])
+
 # Default motor data based on factory type
 def get_default_motors(factory_type):
     """Get default motor configurations based on factory type"""
@@ -234,6 +291,239 @@ def get_default_lighting(factory_type):
     }
     return defaults.get(factory_type, defaults['Textile'])
 
+# Reference tables (rebuilt only when their inputs change)
+@st.cache_data
+def ie_class_table():
+    """IE class comparison table"""
+    return pd.DataFrame({
+        'Class': ['IE1', 'IE2', 'IE3', 'IE4'],
+        'Efficiency Range': ['Standard', 'High', 'Premium', 'Super Premium'],
+        'Typical Savings vs IE1': ['0%', '3-5%', '5-8%', '8-12%']
+    })
+
+@st.cache_data
+def efficiency_table():
+    """Efficiency of each IE class at standard load points"""
+    load_factors = np.array([0.25, 0.5, 0.75, 1.0])
+    class_types = ['IE1', 'IE2', 'IE3', 'IE4']
+    
+    # Evaluate the whole class x load grid in one call
+    class_grid, load_grid = np.meshgrid(MotorSystem.class_indices(class_types), load_factors, indexing='ij')
+    efficiencies = MotorSystem.get_efficiencies(class_grid, load_grid)
+    
+    efficiency_df = pd.DataFrame({'Class': class_types})
+    for j, lf in enumerate(load_factors):
+        efficiency_df[f"{lf:.0%} Load"] = [f"{eff:.1%}" for eff in efficiencies[:, j]]
+    return efficiency_df
+
+@st.cache_data
+def lighting_tech_table(num_fixtures, wattage_per, led_wattage, annual_hours, current_type):
+    """Lighting technology comparison for the current fixture count and hours"""
+    # Current technology keeps its wattage, every alternative is compared at the LED wattage
+    wattages = np.where(LIGHTING_TYPE_NAMES == current_type, wattage_per, led_wattage)
+    energies = num_fixtures * wattages * annual_hours / 1000.0  # kWh
+    
+    return pd.DataFrame({
+        'Technology': LIGHTING_TYPE_NAMES,
+        'Efficacy (lm/W)': LIGHTING_EFFICACIES,
+        'Lifetime (hours)': [f"{lifetime:,}" for lifetime in LIGHTING_LIFETIMES],
+        'Annual Energy (kWh)': [f"{energy:,.0f}" for energy in energies],
+        'Relative Cost': np.select([LIGHTING_TYPE_NAMES == 'LED', LIGHTING_TYPE_NAMES == 'Metal Halide'], ['$$$', '$$'], '$')
+    })
+
+# Retrofit simulation
+@st.cache_data(max_entries=32)
+def compute_retrofit(motors, num_fixtures, wattage_per, led_wattage, daily_hours, operating_days,
+                     total_hours, electricity_cost):
+    """Run the motor, VFD and lighting retrofit calculations
+    
+    `motors` is the motor inventory as a tuple of sorted (key, value) tuples
+    so that Streamlit can hash it; results are cached per set of inputs.
+    """
+    motors_data = [dict(m) for m in motors]
+    
+    # Motor inventory as arrays (one entry per motor line)
+    motor_ids = np.arange(1, len(motors_data) + 1)
+    ratings = np.array([m['rating'] for m in motors_data], dtype=float)
+    quantities = np.array([m['quantity'] for m in motors_data], dtype=int)
+    load_factors = np.array([m['load_factor'] for m in motors_data], dtype=float)
+    classes = np.array([m['current_class'] for m in motors_data], dtype=object)
+    class_idx = MotorSystem.class_indices(classes)
+    vfd_mask = np.array([m['vfd_applicable'] for m in motors_data], dtype=bool)
+    
+    # Current energy consumption
+    current_effs = MotorSystem.get_efficiencies(class_idx, load_factors)
+    current_power = ratings * load_factors
+    current_energy = current_power * total_hours * quantities
+    current_input = np.where(current_effs > 0, current_energy / current_effs, 0.0)
+    
+    # IE4 upgrade
+    ie4_effs = MotorSystem.get_efficiencies(CLASS_IDX['IE4'], load_factors)
+    ie4_input = np.where(ie4_effs > 0, current_energy / ie4_effs, 0.0)
+    motor_energy_savings = current_input - ie4_input
+    motor_cost_savings = motor_energy_savings * electricity_cost
+    current_motor_costs = MOTOR_COST_ARR[class_idx]
+    upgrade_costs = np.maximum(ratings * quantities * (MOTOR_COST_ARR[CLASS_IDX['IE4']] - current_motor_costs), 100.0)  # Minimum cost
+    
+    motor_upgrades = pd.DataFrame({
+        'motor_id': motor_ids,
+        'rating': ratings,
+        'quantity': quantities,
+        'current_class': classes,
+        'energy_savings': motor_energy_savings,
+        'cost_savings': motor_cost_savings,
+        'upgrade_cost': upgrade_costs,
+        'payback_years': np.where(motor_cost_savings > 0, upgrade_costs / motor_cost_savings, 999.0)
+    })
+    
+    # VFD savings for applicable motors
+    vfd_energy_savings, vfd_cost_savings, vfd_savings_pct = MotorSystem.calculate_vfd_savings(
+        load_factors[vfd_mask], ratings[vfd_mask], total_hours * quantities[vfd_mask], electricity_cost
+    )
+    vfd_costs = ratings[vfd_mask] * quantities[vfd_mask] * 100.0  # $100/kW for VFD
+    
+    vfd_savings = pd.DataFrame({
+        'motor_id': motor_ids[vfd_mask],
+        'rating': ratings[vfd_mask],
+        'quantity': quantities[vfd_mask],
+        'energy_savings': vfd_energy_savings,
+        'cost_savings': vfd_cost_savings,
+        'vfd_cost': vfd_costs,
+        'payback_years': np.where(vfd_cost_savings > 0, vfd_costs / vfd_cost_savings, 999.0),
+        'savings_pct': vfd_savings_pct
+    })
+    
+    # Calculate lighting retrofit savings
+    current_lighting_energy = LightingSystem.calculate_lighting_energy(
+        num_fixtures, wattage_per, daily_hours * operating_days
+    )
+    led_energy = LightingSystem.calculate_lighting_energy(
+        num_fixtures, led_wattage, daily_hours * operating_days
+    )
+    lighting_energy_savings = current_lighting_energy - led_energy
+    lighting_cost_savings = lighting_energy_savings * electricity_cost
+    lighting_retrofit_cost = num_fixtures * LightingSystem.LIGHTING_TYPES['LED']['cost_per_unit'] * 10.0  # Including installation
+    
+    lighting_retrofit = {
+        'current_energy': float(current_lighting_energy),
+        'led_energy': float(led_energy),
+        'energy_savings': float(lighting_energy_savings),
+        'cost_savings': float(lighting_cost_savings),
+        'retrofit_cost': float(lighting_retrofit_cost),
+        'payback_years': float(lighting_retrofit_cost / lighting_cost_savings if lighting_cost_savings > 0 else 999.0)
+    }
+    
+    return {
+        'motor_upgrades': motor_upgrades,
+        'vfd_savings': vfd_savings,
+        'lighting_retrofit': lighting_retrofit,
+        'total_energy_savings': float(motor_energy_savings.sum() + vfd_energy_savings.sum() + lighting_energy_savings),
+        'total_cost_savings': float(motor_cost_savings.sum() + vfd_cost_savings.sum() + lighting_cost_savings),
+        'total_investment': float(upgrade_costs.sum() + vfd_costs.sum() + lighting_retrofit_cost)
+    }
+
+# Report tables (rebuilt only when the recommendations or report values change)
+@st.cache_data(show_spinner=False)
+def build_roadmap(recs, current_year):
+    """Implementation roadmap for the top recommendations
+    
+    `recs` holds (description, priority, payback_years) tuples, best measure first.
+    """
+    descriptions = np.array([description for description, _, _ in recs], dtype=object)
+    priorities = np.array([priority for _, priority, _ in recs], dtype=object)
+    paybacks = np.fromiter((payback for _, _, payback in recs), dtype=float, count=len(recs))
+    durations = np.minimum(6, (paybacks * 12).astype(int))
+    
+    # Phase 1 covers every measure, Phase 2 follows up from the third measure on
+    rows = np.concatenate([np.arange(len(recs)), np.arange(2, len(recs))])
+    phase2 = np.arange(rows.size) >= len(recs)
+    
+    roadmap_df = pd.DataFrame({
+        'Year': current_year + phase2.astype(int),
+        'Phase': np.where(phase2, 'Phase 2', 'Phase 1'),
+        'Action': descriptions[rows],
+        'Duration': [f"{months} months" for months in durations[rows]],
+        'Priority': priorities[rows]
+    })
+    
+    # Low-cardinality columns are stored as categories
+    for c in ('Phase', 'Priority', 'Year'):
+        roadmap_df[c] = roadmap_df[c].astype('category')
+    
+    return roadmap_df
+
+def build_report_dict(factory_type, analysis_date, total_hours, electricity_cost, total_energy_savings,
+                      total_cost_savings, co2_reduction, n_recs):
+    """Formatted summary report values"""
+    return {
+        'Factory Type': factory_type,
+        'Analysis Date': analysis_date,
+        'Annual Operating Hours': f"{total_hours:,}",
+        'Electricity Cost': f"${electricity_cost}/kWh",
+        'Total Energy Savings': f"{total_energy_savings:,.0f} kWh",
+        'Total Cost Savings': f"${total_cost_savings:,.0f}",
+        'CO₂ Reduction': f"{co2_reduction:,.1f} tons",
+        'Number of Recommendations': f"{n_recs}"
+    }
+
+@st.cache_data(show_spinner=False)
+def build_report_table(parameters, values):
+    """Two-column summary report (Arrow table) from parallel parameter and value tuples"""
+    return pa.table({'Parameter': list(parameters), 'Value': list(values)})
+
+# Report exports
+def to_csv_bytes(table, decimals=None, compresslevel=None):
+    """Serialize an Arrow table to CSV bytes with the native Arrow writer
+    
+    When `decimals` is given, float columns are rounded to at most that many
+    places up front; the writer still prints the shortest form (0.4, 3). When
+    `compresslevel` is given, the CSV is gzipped at that level.
+    """
+    if decimals is not None:
+        table = pa.table({
+            name: pc.round(column, decimals) if pa.types.is_floating(column.type) else column
+            for name, column in zip(table.column_names, table.columns)
+        })
+    buf = pa.BufferOutputStream()
+    pacsv.write_csv(table, buf)
+    payload = buf.getvalue().to_pybytes()
+    if compresslevel is not None:
+        payload = gzip.compress(payload, compresslevel=compresslevel)
+    return payload
+
+def to_parquet_bytes(table):
+    """Serialize an Arrow table to Parquet (Snappy) bytes for download"""
+    buf = pa.BufferOutputStream()
+    pq.write_table(table, buf, compression='snappy', use_dictionary=False)
+    return buf.getvalue().to_pybytes()
+
+def to_feather_bytes(table):
+    """Serialize an Arrow table to uncompressed Feather (Arrow IPC) bytes for download"""
+    buf = pa.BufferOutputStream()
+    feather.write_feather(table, buf, compression='uncompressed')
+    return buf.getvalue().to_pybytes()
+
+def recommendations_table(recommendations):
+    """Arrow table of the recommendations, built column by column without pandas"""
+    return pa.table({key: [rec[key] for rec in recommendations] for key in recommendations[0]})
+
+def cached_value(cache, name, key, build):
+    """Return the value stored under `name` in `cache`, rebuilding it only when `key` changes"""
+    if cache.get(name, (None, None))[0] != key:
+        cache[name] = (key, build())
+    return cache[name][1]
+
+# CSV downloads are gzipped at the fastest level: text shrinks several-fold for little CPU
+CSV_GZIP_LEVEL = 1
+
+# Detailed analysis download formats: label -> (serializer, file extension, MIME type)
+DETAIL_FORMATS = {
+    'Feather': (to_feather_bytes, 'arrow', 'application/vnd.apache.arrow.file'),
+    'Parquet': (to_parquet_bytes, 'parquet', 'application/octet-stream'),
+    'Gzipped CSV': (lambda table: to_csv_bytes(table, decimals=2, compresslevel=CSV_GZIP_LEVEL),
+                    'csv.gz', 'application/gzip')
+}
+
 # Main content area
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Motor Systems", "💡 Lighting Systems", "📈 Simulation Results", "🎯 Recommendations"])
 
@@ -246,77 +536,46 @@ with tab1:
     with col1:
         st.markdown("#### Motor Inventory")
         
-        # Motor data input
-        default_motors = get_default_motors(factory_type)
-        motors_data = []
-        
-        for i, motor in enumerate(default_motors):
-            cols = st.columns([2, 2, 2, 2, 2])
-            with cols[0]:
-                rating = st.number_input(f"Rating (kW) #{i+1}", 
-                                       min_value=0.75, 
-                                       max_value=500.0, 
-                                       value=float(motor['rating']), 
-                                       step=0.5, 
-                                       key=f"rating_{i}")
-            with cols[1]:
-                quantity = st.number_input(f"Quantity #{i+1}", 
-                                         min_value=1, 
-                                         max_value=100, 
-                                         value=int(motor['quantity']), 
-                                         key=f"qty_{i}")
-            with cols[2]:
-                load_factor = st.slider(f"Load Factor #{i+1}", 
-                                      min_value=0.1, 
-                                      max_value=1.0, 
-                                      value=float(motor['load_factor']), 
-                                      step=0.05, 
-                                      key=f"load_{i}")
-            with cols[3]:
-                current_class = st.selectbox(f"Current Class #{i+1}", 
-                                           ['IE1', 'IE2', 'IE3', 'IE4'], 
-                                           index=['IE1', 'IE2', 'IE3', 'IE4'].index(motor['current_class']), 
-                                           key=f"class_{i}")
-            with cols[4]:
-                vfd_applicable = st.checkbox(f"VFD Applicable #{i+1}", 
-                                           value=(float(motor['load_factor']) < 0.8), 
-                                           key=f"vfd_{i}")
-            
-            motors_data.append({
-                'rating': float(rating),
-                'quantity': int(quantity),
-                'load_factor': float(load_factor),
-                'current_class': current_class,
-                'vfd_applicable': vfd_applicable
-            })
+        # Motor data input (one editable grid instead of five widgets per motor)
+        motors_df = pd.DataFrame(get_default_motors(factory_type))
+        motors_df['vfd_applicable'] = motors_df['load_factor'] < 0.8
+        
+        edited_motors = st.data_editor(
+            motors_df,
+            column_config={
+                'rating': st.column_config.NumberColumn("Rating (kW)", min_value=0.75, max_value=500.0,
+                                                        step=0.5, required=True),
+                'quantity': st.column_config.NumberColumn("Quantity", min_value=1, max_value=100,
+                                                          step=1, required=True),
+                'load_factor': st.column_config.NumberColumn("Load Factor", min_value=0.1, max_value=1.0,
+                                                             step=0.05, required=True),
+                'current_class': st.column_config.SelectboxColumn("Current Class", options=['IE1', 'IE2', 'IE3', 'IE4'],
+                                                                  default='IE2', required=True),
+                'vfd_applicable': st.column_config.CheckboxColumn("VFD Applicable", default=False)
+            },
+            num_rows='dynamic',
+            hide_index=True,
+            width='stretch',
+            key=f"motors_{factory_type}"
+        )
+        
+        # Rows still being filled in are left out of the simulation
+        motors_data = edited_motors.fillna({'vfd_applicable': False}).dropna().astype({
+            'rating': float,
+            'quantity': int,
+            'load_factor': float,
+            'vfd_applicable': bool
+        }).to_dict('records')
     
     with col2:
         st.markdown("#### Motor Efficiency Standards")
         
         st.markdown("**IE Class Comparison:**")
-        ie_data = pd.DataFrame({
-            'Class': ['IE1', 'IE2', 'IE3', 'IE4'],
-            'Efficiency Range': ['Standard', 'High', 'Premium', 'Super Premium'],
-            'Typical Savings vs IE1': ['0%', '3-5%', '5-8%', '8-12%']
-        })
-        st.table(ie_data)
+        st.table(ie_class_table())
         
         # Display efficiency curves
         st.markdown("**Efficiency at Different Loads:**")
-        load_factors = [0.25, 0.5, 0.75, 1.0]
-        efficiency_data = []
-        for class_type in ['IE1', 'IE2', 'IE3', 'IE4']:
-            efficiencies = [MotorSystem.get_efficiency(class_type, lf) for lf in load_factors]
-            efficiency_data.append({
-                'Class': class_type,
-                '25% Load': f"{efficiencies[0]:.1%}",
-                '50% Load': f"{efficiencies[1]:.1%}",
-                '75% Load': f"{efficiencies[2]:.1%}",
-                '100% Load': f"{efficiencies[3]:.1%}"
-            })
-        
-        efficiency_df = pd.DataFrame(efficiency_data)
-        st.table(efficiency_df)
+        st.table(efficiency_table())
         
         st.info("""
         **VFD Recommendation:**
@@ -376,21 +635,7 @@ with tab2:
         st.markdown("#### Lighting Technology Comparison")
         
         # Create comparison chart
-        tech_data = []
-        for tech, specs in LightingSystem.LIGHTING_TYPES.items():
-            energy = LightingSystem.calculate_lighting_energy(num_fixtures, 
-                                                             wattage_per if tech == lighting_type else led_wattage, 
-                                                             annual_hours)
-            tech_data.append({
-                'Technology': tech,
-                'Efficacy (lm/W)': specs['efficacy'],
-                'Lifetime (hours)': f"{specs['lifetime']:,}",
-                'Annual Energy (kWh)': f"{energy:,.0f}",
-                'Relative Cost': '$$$' if tech == 'LED' else '$$' if tech == 'Metal Halide' else '$'
-            })
-        
-        tech_df = pd.DataFrame(tech_data)
-        st.table(tech_df)
+        st.table(lighting_tech_table(num_fixtures, wattage_per, led_wattage, annual_hours, lighting_type))
         
         # Quick comparison metrics
         st.markdown("**Energy Comparison:**")
@@ -405,114 +650,44 @@ with tab2:
 # Tab 3: Simulation Results
 with tab3:
     if run_simulation:
-        st.markdown('<h2 class="section-header">Simulation Results</h2>', unsafe_allow_html=True)
+        results = compute_retrofit(
+            tuple(tuple(sorted(m.items())) for m in motors_data),
+            num_fixtures, wattage_per, led_wattage, daily_hours, operating_days,
+            total_hours, electricity_cost
+        )
         
-        # Initialize results storage
-        results = {
-            'motor_upgrades': [],
-            'vfd_savings': [],
-            'lighting_retrofit': {}
-        }
-        
-        # Calculate motor upgrade savings
-        total_motor_upgrade_savings = 0.0
-        total_motor_upgrade_cost = 0.0
-        total_vfd_savings = 0.0
-        total_vfd_cost = 0.0
-        
-        for i, motor in enumerate(motors_data):
-            # Current energy consumption
-            current_eff = MotorSystem.get_efficiency(motor['current_class'], motor['load_factor'])
-            current_power = motor['rating'] * motor['load_factor']
-            current_energy = current_power * total_hours * motor['quantity']
-            current_input = current_energy / current_eff if current_eff > 0 else 0.0
-            
-            # IE4 upgrade
-            ie4_eff = MotorSystem.get_efficiency('IE4', motor['load_factor'])
-            ie4_input = current_energy / ie4_eff if ie4_eff > 0 else 0.0
-            energy_savings_motor = current_input - ie4_input
-            cost_savings_motor = energy_savings_motor * electricity_cost
-            current_motor_cost = MotorSystem.MOTOR_COSTS.get(motor['current_class'], MotorSystem.MOTOR_COSTS['IE2'])
-            upgrade_cost = motor['rating'] * motor['quantity'] * (MotorSystem.MOTOR_COSTS['IE4'] - current_motor_cost)
-            
-            results['motor_upgrades'].append({
-                'motor_id': i+1,
-                'rating': motor['rating'],
-                'quantity': motor['quantity'],
-                'current_class': motor['current_class'],
-                'energy_savings': float(energy_savings_motor),
-                'cost_savings': float(cost_savings_motor),
-                'upgrade_cost': float(max(upgrade_cost, 100.0)),  # Minimum cost
-                'payback_years': float(max(upgrade_cost, 100.0) / cost_savings_motor if cost_savings_motor > 0 else 999.0)
-            })
-            
-            total_motor_upgrade_savings += float(cost_savings_motor)
-            total_motor_upgrade_cost += float(max(upgrade_cost, 100.0))
-            
-            # VFD savings if applicable
-            if motor['vfd_applicable']:
-                vfd_energy_savings, vfd_cost_savings, vfd_savings_pct = MotorSystem.calculate_vfd_savings(
-                    motor['load_factor'], motor['rating'], total_hours * motor['quantity'], electricity_cost
-                )
-                vfd_cost = motor['rating'] * motor['quantity'] * 100.0  # $100/kW for VFD
-                
-                results['vfd_savings'].append({
-                    'motor_id': i+1,
-                    'rating': motor['rating'],
-                    'quantity': motor['quantity'],
-                    'energy_savings': float(vfd_energy_savings),
-                    'cost_savings': float(vfd_cost_savings),
-                    'vfd_cost': float(vfd_cost),
-                    'payback_years': float(vfd_cost / vfd_cost_savings if vfd_cost_savings > 0 else 999.0),
-                    'savings_pct': float(vfd_savings_pct)
-                })
-                
-                total_vfd_savings += float(vfd_cost_savings)
-                total_vfd_cost += float(vfd_cost)
+        # Keep the latest run, and the inputs it used, available to later reruns and to the Recommendations tab
+        st.session_state.update({
+            'results': results, 'led_wattage': led_wattage, 'num_fixtures': num_fixtures,
+            'run_inputs': {'factory_type': factory_type, 'total_hours': total_hours,
+                           'electricity_cost': electricity_cost, 'carbon_factor': carbon_factor}
+        })
+    
+    if 'results' in st.session_state:
+        st.markdown('<h2 class="section-header">Simulation Results</h2>', unsafe_allow_html=True)
         
-        # Calculate lighting retrofit savings
-        current_lighting_energy = LightingSystem.calculate_lighting_energy(
-            num_fixtures, wattage_per, daily_hours * operating_days
-        )
-        led_energy = LightingSystem.calculate_lighting_energy(
-            num_fixtures, led_wattage, daily_hours * operating_days
-        )
-        lighting_energy_savings = current_lighting_energy - led_energy
-        lighting_cost_savings = lighting_energy_savings * electricity_cost
-        lighting_retrofit_cost = num_fixtures * LightingSystem.LIGHTING_TYPES['LED']['cost_per_unit'] * 10.0  # Including installation
-        
-        results['lighting_retrofit'] = {
-            'current_energy': float(current_lighting_energy),
-            'led_energy': float(led_energy),
-            'energy_savings': float(lighting_energy_savings),
-            'cost_savings': float(lighting_cost_savings),
-            'retrofit_cost': float(lighting_retrofit_cost),
-            'payback_years': float(lighting_retrofit_cost / lighting_cost_savings if lighting_cost_savings > 0 else 999.0)
-        }
+        results = st.session_state['results']
+        run_inputs = st.session_state['run_inputs']  # Figures below follow the run, not later sidebar edits
+        total_energy_savings = results['total_energy_savings']
+        total_cost_savings = results['total_cost_savings']
         
         # Display results
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            total_energy_savings = (sum([m['energy_savings'] for m in results['motor_upgrades']]) +
-                                   sum([v['energy_savings'] for v in results['vfd_savings']]) +
-                                   results['lighting_retrofit']['energy_savings'])
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
             st.metric("Total Annual Energy Savings", f"{total_energy_savings:,.0f} kWh", 
-                     delta=f"${total_energy_savings * electricity_cost:,.0f}")
+                     delta=f"${total_energy_savings * run_inputs['electricity_cost']:,.0f}")
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
-            total_cost_savings = (sum([m['cost_savings'] for m in results['motor_upgrades']]) +
-                                 sum([v['cost_savings'] for v in results['vfd_savings']]) +
-                                 results['lighting_retrofit']['cost_savings'])
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
             st.metric("Total Annual Cost Savings", f"${total_cost_savings:,.0f}", 
-                     delta=f"{total_cost_savings/electricity_cost:,.0f} kWh")
+                     delta=f"{total_cost_savings/run_inputs['electricity_cost']:,.0f} kWh")
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col3:
-            co2_reduction = total_energy_savings * carbon_factor / 1000.0  # Tons
+            co2_reduction = total_energy_savings * run_inputs['carbon_factor'] / 1000.0  # Tons
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
             st.metric("CO₂ Reduction", f"{co2_reduction:,.1f} tons/year", 
                      delta=f"Equivalent to {co2_reduction/5:.0f} cars off the road")
@@ -520,8 +695,8 @@ with tab3:
         
         # Detailed results in expandable sections
         with st.expander("📊 Motor Efficiency Upgrade Analysis", expanded=True):
-            if results['motor_upgrades']:
-                motor_df = pd.DataFrame(results['motor_upgrades'])
+            if not results['motor_upgrades'].empty:
+                motor_df = results['motor_upgrades']
                 st.dataframe(motor_df.style.format({
                     'rating': '{:.1f}',
                     'energy_savings': '{:,.0f}',
@@ -544,8 +719,8 @@ with tab3:
                 st.plotly_chart(fig, use_container_width=True)
         
         with st.expander("⚙️ VFD Implementation Analysis"):
-            if results['vfd_savings']:
-                vfd_df = pd.DataFrame(results['vfd_savings'])
+            if not results['vfd_savings'].empty:
+                vfd_df = results['vfd_savings']
                 st.dataframe(vfd_df.style.format({
                     'rating': '{:.1f}',
                     'energy_savings': '{:,.0f}',
@@ -556,9 +731,15 @@ with tab3:
                 }))
                 
                 # Payback period visualization
-                fig = px.bar(vfd_df, x='motor_id', y='payback_years',
-                           title="VFD Payback Period by Motor",
-                           labels={'payback_years': 'Payback Period (Years)', 'motor_id': 'Motor ID'})
+                fig = go.Figure(data=[go.Bar(
+                    x=vfd_df['motor_id'], y=vfd_df['payback_years'],
+                    hovertemplate="Motor ID=%{x}<br>Payback Period (Years)=%{y}<extra></extra>"
+                )])
+                fig.update_layout(
+                    title="VFD Payback Period by Motor",
+                    xaxis_title="Motor ID",
+                    yaxis_title="Payback Period (Years)"
+                )
                 fig.add_hline(y=3, line_dash="dash", line_color="red", 
                             annotation_text="3-Year Target", annotation_position="top right")
                 st.plotly_chart(fig, use_container_width=True)
@@ -570,12 +751,12 @@ with tab3:
             with col1:
                 st.markdown("**Current System:**")
                 st.metric("Annual Energy", f"{lighting_data['current_energy']:,.0f} kWh")
-                st.metric("Annual Cost", f"${lighting_data['current_energy'] * electricity_cost:,.0f}")
+                st.metric("Annual Cost", f"${lighting_data['current_energy'] * run_inputs['electricity_cost']:,.0f}")
             
             with col2:
                 st.markdown("**LED System:**")
                 st.metric("Annual Energy", f"{lighting_data['led_energy']:,.0f} kWh")
-                st.metric("Annual Cost", f"${lighting_data['led_energy'] * electricity_cost:,.0f}")
+                st.metric("Annual Cost", f"${lighting_data['led_energy'] * run_inputs['electricity_cost']:,.0f}")
             
             st.markdown("**Retrofit Economics:**")
             col3, col4, col5 = st.columns(3)
@@ -589,10 +770,10 @@ with tab3:
         
         # Cumulative savings over time
         with st.expander("📈 10-Year Projection"):
-            years = list(range(1, 11))
-            cumulative_savings = [total_cost_savings * y for y in years]
-            cumulative_cost = [total_motor_upgrade_cost + total_vfd_cost + lighting_retrofit_cost] * len(years)
-            net_savings = [cumulative_savings[i] - cumulative_cost[0] for i in range(len(years))]
+            years = np.arange(1, 11)
+            cumulative_savings = total_cost_savings * years
+            cumulative_cost = np.full(len(years), results['total_investment'])
+            net_savings = cumulative_savings - cumulative_cost
             
             fig = go.Figure()
             fig.add_trace(go.Scatter(x=years, y=cumulative_savings, mode='lines+markers', 
@@ -609,14 +790,12 @@ with tab3:
                 hovermode='x unified'
             )
             
-            # Find break-even point
-            break_even = None
-            for i, net in enumerate(net_savings):
-                if net >= 0:
-                    break_even = years[i]
-                    fig.add_vline(x=break_even, line_dash="dash", line_color="orange",
-                                annotation_text=f"Break-even: Year {break_even}")
-                    break
+            # Find break-even point (first year with non-negative net savings)
+            idx = int(np.argmax(net_savings >= 0))
+            break_even = int(years[idx]) if net_savings[idx] >= 0 else None
+            if break_even:
+                fig.add_vline(x=break_even, line_dash="dash", line_color="orange",
+                            annotation_text=f"Break-even: Year {break_even}")
             
             st.plotly_chart(fig, use_container_width=True)
             
@@ -629,167 +808,132 @@ with tab3:
 with tab4:
     st.markdown('<h2 class="section-header">Prioritized Retrofit Recommendations</h2>', unsafe_allow_html=True)
     
-    if not run_simulation:
+    if 'results' not in st.session_state:
         st.info("👈 Run the simulation first to get personalized recommendations")
     else:
-        # Create priority list
-        recommendations = []
+        results = st.session_state['results']
+        run_inputs = st.session_state['run_inputs']
         
-        # Add motor upgrades
-        for motor in results['motor_upgrades']:
-            if motor['payback_years'] <= 5:  # Only recommend if payback <= 5 years
-                recommendations.append({
-                    'type': 'Motor Upgrade',
-                    'description': f"Motor {motor['motor_id']}: IE{motor['current_class'][-1]} → IE4 ({motor['rating']}kW × {motor['quantity']})",
-                    'investment': f"${motor['upgrade_cost']:,.0f}",
-                    'annual_savings': f"${motor['cost_savings']:,.0f}",
-                    'payback': f"{motor['payback_years']:.1f} years",
-                    'priority': 'High' if motor['payback_years'] <= 2 else 'Medium',
-                    'sort_key': 1.0/motor['payback_years'] if motor['payback_years'] > 0 else 0.0
-                })
-        
-        # Add VFD implementations
-        for vfd in results['vfd_savings']:
-            if vfd['payback_years'] <= 4:  # Only recommend if payback <= 4 years
-                recommendations.append({
-                    'type': 'VFD Installation',
-                    'description': f"Motor {vfd['motor_id']}: {vfd['rating']}kW VFD ({vfd['quantity']} units)",
-                    'investment': f"${vfd['vfd_cost']:,.0f}",
-                    'annual_savings': f"${vfd['cost_savings']:,.0f}",
-                    'payback': f"{vfd['payback_years']:.1f} years",
-                    'priority': 'High' if vfd['payback_years'] <= 2 else 'Medium',
-                    'sort_key': 1.0/vfd['payback_years'] if vfd['payback_years'] > 0 else 0.0
-                })
-        
-        # Add lighting retrofit
+        # Candidate measures, in order: motor upgrades, VFD installations, lighting retrofit
+        motor_df = results['motor_upgrades']
+        vfd_df = results['vfd_savings']
         lighting = results['lighting_retrofit']
-        if lighting['payback_years'] <= 5:
+        n_motor, n_vfd = len(motor_df), len(vfd_df)
+        
+        paybacks = np.concatenate([motor_df['payback_years'], vfd_df['payback_years'], [lighting['payback_years']]])
+        max_paybacks = np.concatenate([np.full(n_motor, 5.0), np.full(n_vfd, 4.0), [5.0]])  # Only recommend within these paybacks
+        investments = np.concatenate([motor_df['upgrade_cost'], vfd_df['vfd_cost'], [lighting['retrofit_cost']]])
+        annual_savings = np.concatenate([motor_df['cost_savings'], vfd_df['cost_savings'], [lighting['cost_savings']]])
+        sort_keys = np.where(paybacks > 0, 1.0 / paybacks, 0.0)
+        
+        # Filter, then sort by priority (highest ROI first)
+        viable = np.flatnonzero(paybacks <= max_paybacks)
+        order = viable[np.argsort(-sort_keys[viable], kind='stable')]
+        
+        # Create priority list, formatting only the measures that made the cut
+        recommendations = []
+        for idx in order:
+            if idx < n_motor:
+                motor_id, rating, quantity = (motor_df.at[idx, c] for c in ('motor_id', 'rating', 'quantity'))
+                measure_type = 'Motor Upgrade'
+                description = f"Motor {motor_id}: IE{motor_df.at[idx, 'current_class'][-1]} → IE4 ({rating}kW × {quantity})"
+            elif idx < n_motor + n_vfd:
+                motor_id, rating, quantity = (vfd_df.at[idx - n_motor, c] for c in ('motor_id', 'rating', 'quantity'))
+                measure_type = 'VFD Installation'
+                description = f"Motor {motor_id}: {rating}kW VFD ({quantity} units)"
+            else:
+                measure_type = 'Lighting Retrofit'
+                description = f"LED Retrofit: {st.session_state['num_fixtures']} fixtures × {st.session_state['led_wattage']}W LED"
+            
             recommendations.append({
-                'type': 'Lighting Retrofit',
-                'description': f"LED Retrofit: {num_fixtures} fixtures × {led_wattage}W LED",
-                'investment': f"${lighting['retrofit_cost']:,.0f}",
-                'annual_savings': f"${lighting['cost_savings']:,.0f}",
-                'payback': f"{lighting['payback_years']:.1f} years",
-                'priority': 'High' if lighting['payback_years'] <= 2 else 'Medium',
-                'sort_key': 1.0/lighting['payback_years'] if lighting['payback_years'] > 0 else 0.0
+                'type': measure_type,
+                'description': description,
+                'investment': f"${investments[idx]:,.0f}",
+                'annual_savings': f"${annual_savings[idx]:,.0f}",
+                'payback': f"{paybacks[idx]:.1f} years",
+                'payback_years': float(paybacks[idx]),
+                'priority': 'High' if paybacks[idx] <= 2 else 'Medium',
+                'sort_key': float(sort_keys[idx])
             })
         
-        # Sort by priority (highest ROI first)
-        recommendations.sort(key=lambda x: x['sort_key'], reverse=True)
-        
         if not recommendations:
             st.warning("No retrofit measures meet the investment criteria. Consider reviewing input parameters.")
         else:
             # Display recommendations
             st.markdown(f"### 🎯 Found {len(recommendations)} Viable Retrofit Measures")
             
-            for i, rec in enumerate(recommendations):
-                priority_color = {
-                    'High': '#EF4444',
-                    'Medium': '#F59E0B',
-                    'Low': '#10B981'
-                }.get(rec['priority'], '#6B7280')
-                
-                st.markdown(f"""
-                <div class="recommendation-card">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <div>
-                            <h4 style="margin: 0; color: {priority_color};">{rec['type']} • {rec['priority']} Priority</h4>
-                            <p style="margin: 0.5rem 0; color: #4B5563;">{rec['description']}</p>
-                        </div>
-                        <div style="background-color: {priority_color}; color: white; padding: 0.5rem 1rem; border-radius: 5px; font-weight: bold;">
-                            #{i+1}
-                        </div>
-                    </div>
-                    <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-top: 1rem;">
-                        <div>
-                            <small>Investment</small>
-                            <p style="font-weight: bold; margin: 0.25rem 0;">{rec['investment']}</p>
-                        </div>
-                        <div>
-                            <small>Annual Savings</small>
-                            <p style="font-weight: bold; margin: 0.25rem 0;">{rec['annual_savings']}</p>
-                        </div>
-                        <div>
-                            <small>Payback Period</small>
-                            <p style="font-weight: bold; margin: 0.25rem 0;">{rec['payback']}</p>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            # All cards go out in a single markdown element
+            cards_html = [
+                RECOMMENDATION_CARD_HTML.substitute(
+                    rec, rank=i+1, priority_color=PRIORITY_COLORS.get(rec['priority'], '#6B7280')
+                )
+                for i, rec in enumerate(recommendations)
+            ]
+            st.markdown('\n'.join(cards_html), unsafe_allow_html=True)
             
             # Implementation roadmap
             st.markdown("### 🗺️ Recommended Implementation Roadmap")
             
-            roadmap_data = []
-            current_year = datetime.now().year
+            # One timestamp for the roadmap, report date and file names
+            now = datetime.now()
+            current_year = now.year
+            analysis_date = now.strftime("%Y-%m-%d")
+            file_stamp = now.strftime("%Y%m%d")
             
-            for i, rec in enumerate(recommendations[:5]):  # Top 5 recommendations
-                payback = float(rec['payback'].split()[0])
-                roadmap_data.append({
-                    'Year': current_year,
-                    'Phase': 'Phase 1',
-                    'Action': rec['description'],
-                    'Duration': f"{min(6, int(payback*12))} months",
-                    'Priority': rec['priority']
-                })
-                
-                if i >= 2:  # Phase 2 for next set
-                    roadmap_data.append({
-                        'Year': current_year + 1,
-                        'Phase': 'Phase 2',
-                        'Action': rec['description'],
-                        'Duration': f"{min(6, int(payback*12))} months",
-                        'Priority': rec['priority']
-                    })
-            
-            roadmap_df = pd.DataFrame(roadmap_data)
+            roadmap_df = build_roadmap(
+                tuple((rec['description'], rec['priority'], rec['payback_years']) for rec in recommendations[:5]),  # Top 5 recommendations
+                current_year
+            )
             st.dataframe(roadmap_df, use_container_width=True)
             
             # Download report
             st.markdown("### 📄 Download Report")
             
-            report_data = {
-                'Factory Type': factory_type,
-                'Analysis Date': datetime.now().strftime("%Y-%m-%d"),
-                'Annual Operating Hours': f"{total_hours:,}",
-                'Electricity Cost': f"${electricity_cost}/kWh",
-                'Total Energy Savings': f"{total_energy_savings:,.0f} kWh",
-                'Total Cost Savings': f"${total_cost_savings:,.0f}",
-                'CO₂ Reduction': f"{co2_reduction:,.1f} tons",
-                'Number of Recommendations': len(recommendations)
-            }
+            report_data = build_report_dict(run_inputs['factory_type'], analysis_date, run_inputs['total_hours'],
+                                            run_inputs['electricity_cost'], total_energy_savings, total_cost_savings,
+                                            co2_reduction, len(recommendations))
             
-            report_df = pd.DataFrame(list(report_data.items()), columns=['Parameter', 'Value'])
+            report_table = build_report_table(tuple(report_data.keys()), tuple(report_data.values()))
+            
+            # Serialize only when a download is actually requested, and only again once the content changes.
+            # The callables run outside the script thread, so they share a plain dict kept in session state.
+            download_cache = st.session_state.setdefault('_download_cache', {})
+            
+            def _summary_bytes():
+                return cached_value(download_cache, 'summary', tuple(report_data.items()),
+                                    lambda: to_csv_bytes(report_table, compresslevel=CSV_GZIP_LEVEL))
+            
+            # The recommendations table is built once and shared by every detailed-analysis format
+            rec_key = tuple(tuple(rec.items()) for rec in recommendations)
+            
+            def _recommendations_table():
+                return cached_value(download_cache, 'recommendations', rec_key,
+                                    lambda: recommendations_table(recommendations))
+            
+            def _detail_bytes():
+                return cached_value(download_cache, 'detail', (detail_format, rec_key),
+                                    lambda: detail_serializer(_recommendations_table()))
             
             col1, col2 = st.columns(2)
             with col1:
                 st.download_button(
-                    label="📥 Download Summary Report (CSV)",
-                    data=report_df.to_csv(index=False).encode('utf-8'),
-                    file_name=f"energy_audit_report_{factory_type}_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
+                    label="📥 Download Summary Report (Gzipped CSV)",
+                    data=_summary_bytes,
+                    file_name=f"energy_audit_report_{run_inputs['factory_type']}_{file_stamp}.csv.gz",
+                    mime="application/gzip"
                 )
             
             with col2:
+                detail_format = st.radio("Detailed analysis format", list(DETAIL_FORMATS), horizontal=True,
+                                         help="Feather reloads fastest into pandas/Arrow; Parquet is smaller on disk; gzipped CSV unpacks to a spreadsheet-ready file")
+                detail_serializer, detail_ext, detail_mime = DETAIL_FORMATS[detail_format]
                 st.download_button(
-                    label="📥 Download Detailed Analysis (Excel)",
-                    data=pd.DataFrame(recommendations).to_csv(index=False).encode('utf-8'),
-                    file_name=f"detailed_analysis_{factory_type}_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
+                    label=f"📥 Download Detailed Analysis ({detail_format})",
+                    data=_detail_bytes,
+                    file_name=f"detailed_analysis_{run_inputs['factory_type']}_{file_stamp}.{detail_ext}",
+                    mime=detail_mime
                 )
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div class="footer">
-    <p><strong>Factory Energy Retrofit Simulator</strong> | Professional Energy Audit Tool v2.1</p>
-    <p>Made By <strong>Areeb Rizwan</strong>, Mechanical Engineer</p>
-    <p>🌐 Website: <a href="https://www.areebrizwan.com" target="_blank">www.areebrizwan.com</a></p>
-    <p>💼 LinkedIn: <a href="https://www.linkedin.com/in/areebrizwan" target="_blank">www.linkedin.com/in/areebrizwan</a></p>
-    <p style="font-size: 0.8rem; margin-top: 1rem; color: #9CA3AF;">
-        Disclaimer: This tool provides estimates based on standard engineering models. 
-        Actual savings may vary based on specific site conditions and implementation.
-    </p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)